@@ -1,90 +1,17 @@
 # streamlit_app.py
 import streamlit as st
-import json
-from openai import OpenAI
-
-# ----------------------------
-# Initialize OpenAI client
-# ----------------------------
-client = OpenAI(api_key=st.secrets["OPENAI_API_KEY"])  # Store your key in .streamlit/secrets.toml
-
-
-def askAI(prompt):
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[{"role": "user", "content": prompt}]
-    )
-    return response.choices[0].message.content
-
-
-# ----------------------------
-# Agent 1: Planning Agent
-# ----------------------------
-def get_diagnostic_plan(patient_input):
-    prompt = f"""         
-You are a medical planning agent. Based solely on the information provided below — 
-without the patient being physically present — break down the case into a clear, medically sound diagnostic plan.
-
-Return the output as a JSON array of objects.
-
-Each object must contain:
-- "step_number": the step number
-- "instruction": an actionable diagnostic or evaluation step.
-
-Patient Data:
-{patient_input}
-"""
-    ai_response = askAI(prompt)
-    return json.loads(ai_response)
 
+from service_client import SERVICE_URL, ServiceClient, ServiceError
 
 # ----------------------------
-# Agent 2: Worker Agent
+# Agents service client: the planning, worker and orchestrator agents run in service/medic.py
 # ----------------------------
-def perform_diagnostic_step(step, accumulated_context):
-    prompt = f"""
-You are a medical assistant AI. Execute the following diagnostic instruction:
-
-Instruction: {step['instruction']}
-
-Patient context so far:
-{accumulated_context}
-
-Respond with the output of this step in clearly formatted text or JSON.
-"""
-    step_output = askAI(prompt)
-    return step_output
-
-
-def run_full_diagnostic_plan(diagnostic_steps, patient_input):
-    accumulated_context = {"patient_input": patient_input}
-    step_results = []
-    for step in diagnostic_steps:
-        result = perform_diagnostic_step(step, accumulated_context)
-        step_results.append({"step": step, "result": result})
-        accumulated_context[f"Step{step['step_number']}"] = result
-    return step_results
-
-
-# ----------------------------
-# Agent 3: Orchestrator Agent
-# ----------------------------
-def create_diagnostic_summary(diagnostic_outputs, patient_input):
-    prompt = f"""
-You are a medical orchestrator AI. The user has input: {patient_input}
-You received the following results from medical worker agents:
-
-{diagnostic_outputs}
+@st.cache_resource
+def get_service():
+    return ServiceClient(SERVICE_URL)
 
-Synthesize a final diagnostic summary that:
-- Interprets all findings
-- Lists suspected diseases
-- Suggests tests
-- Advises next medical steps
 
-Respond in clear bullet points.
-"""
-    return askAI(prompt)
+service = get_service()
 
 
 # ----------------------------
@@ -105,11 +32,24 @@ if page == "Patient Input":
         "I’ve been experiencing chest pain, especially when I breathe deeply, fatigue, and shortness of breath after climbing stairs.\nI have a history of mild asthma but no recent attacks.")
     
     if st.button("Run Diagnostics"):
+        for key in ("diagnostic_steps", "diagnostic_outputs", "final_summary"):
+            st.session_state.pop(key, None)
         st.session_state["patient_input"] = patient_input
-        st.session_state["diagnostic_steps"] = get_diagnostic_plan(patient_input)
-        st.session_state["diagnostic_outputs"] = run_full_diagnostic_plan(st.session_state["diagnostic_steps"], patient_input)
-        st.session_state["final_summary"] = create_diagnostic_summary(st.session_state["diagnostic_outputs"], patient_input)
-        st.success("Diagnostics Completed ✅")
+        try:
+            with st.status("Running diagnostics...") as status:
+                for event in service.stream_events("/medic/diagnostics", {"patient_input": patient_input}):
+                    if event["event"] == "plan":
+                        st.session_state["diagnostic_steps"] = event["diagnostic_steps"]
+                        st.session_state["diagnostic_outputs"] = []
+                        st.write(f"🧩 Plan ready: {len(event['diagnostic_steps'])} steps")
+                    elif event["event"] == "step":
+                        st.session_state["diagnostic_outputs"].append({"step": event["step"], "result": event["result"]})
+                        st.write(f"⚙️ Step {event['step']['step_number']} done")
+                    elif event["event"] == "summary":
+                        st.session_state["final_summary"] = event["final_summary"]
+                status.update(label="Diagnostics Completed ✅", state="complete")
+        except ServiceError as e:
+            st.error(f"Diagnostics failed: {e}")
 
 # Planning Agent
 elif page == "Planning Agent":
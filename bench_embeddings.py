@@ -0,0 +1,109 @@
+# Benchmark reduced-dimension and quantized embedding storage against the current
+# full-precision setup (1536-d float32, exact cosine search).
+#
+#   python bench_embeddings.py                              # synthetic clustered corpus
+#   python bench_embeddings.py --embeddings corpus.npy      # real 1536-d text-embedding-3-small vectors
+#
+# Shorter vectors are simulated by truncating and re-normalising the 1536-d vectors, which is
+# what the model's `dimensions` option does. Recall@k is measured against exact float32 search
+# at 1536 dimensions, so it covers the loss from both dimension reduction and quantization.
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from vector_store import QuantizedVectorStore, normalize
+
+FULL_DIMENSIONS = 1536
+
+
+def synthetic_corpus(n_vectors, n_queries, seed=0):
+    # Clustered vectors with a decaying spectrum, closer to real embeddings than pure noise
+    rng = np.random.default_rng(seed)
+    spectrum = 1.0 / np.sqrt(np.arange(1, FULL_DIMENSIONS + 1))
+    centers = rng.normal(size=(max(n_vectors // 50, 1), FULL_DIMENSIONS)) * spectrum
+    labels = rng.integers(0, len(centers), size=n_vectors)
+    corpus = centers[labels] + 0.5 * rng.normal(size=(n_vectors, FULL_DIMENSIONS)) * spectrum
+    picks = rng.integers(0, n_vectors, size=n_queries)
+    queries = corpus[picks] + 0.3 * rng.normal(size=(n_queries, FULL_DIMENSIONS)) * spectrum
+    return normalize(corpus), normalize(queries)
+
+
+def load_corpus(path, n_queries, seed=0):
+    corpus = normalize(np.load(path))
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(len(corpus), size=n_queries, replace=False)
+    queries = corpus[picks]
+    corpus = np.delete(corpus, picks, axis=0)
+    return corpus, queries
+
+
+def recall_at_k(found, expected):
+    return len(set(found) & set(expected)) / len(expected)
+
+
+def run(corpus, queries, dimensions, precisions, k, rescore_factor):
+    ids = [str(i) for i in range(len(corpus))]
+    documents = [""] * len(corpus)
+
+    # Ground truth: exact search over the full-precision, full-dimension vectors
+    truth = [list(np.argsort(-(corpus @ q))[:k].astype(str)) for q in queries]
+
+    rows = []
+    for dims in dimensions:
+        vectors = normalize(corpus[:, :dims])
+        query_vectors = normalize(queries[:, :dims])
+        for precision in precisions:
+            for rescore in ([False] if precision == "float32" else [False, True]):
+                with tempfile.TemporaryDirectory() as path:
+                    store = QuantizedVectorStore(path, dims, precision, rescore_factor)
+                    store.upsert(ids, vectors, documents)
+
+                    latencies, recalls = [], []
+                    for query, expected in zip(query_vectors, truth):
+                        start = time.perf_counter()
+                        matches = store.query(query, n_results=k, rescore=rescore)
+                        latencies.append(time.perf_counter() - start)
+                        recalls.append(recall_at_k([m["id"] for m in matches], expected))
+
+                    rows.append({
+                        "dims": dims,
+                        "precision": precision,
+                        "rescore": rescore,
+                        "memory_mb": store.memory_bytes() / 2**20,
+                        "p50_ms": np.percentile(latencies, 50) * 1000,
+                        "p95_ms": np.percentile(latencies, 95) * 1000,
+                        "recall": float(np.mean(recalls)),
+                    })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reduced-dimension and quantized embedding storage")
+    parser.add_argument("--embeddings", help=".npy file of 1536-d embeddings (defaults to a synthetic corpus)")
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[1536, 512, 256])
+    parser.add_argument("--precisions", nargs="+", default=["float32", "float16", "int8"])
+    args = parser.parse_args()
+
+    if args.embeddings:
+        corpus, queries = load_corpus(args.embeddings, args.queries)
+    else:
+        corpus, queries = synthetic_corpus(args.vectors, args.queries)
+    print(f"corpus={len(corpus)} queries={len(queries)} k={args.k} rescore_factor={args.rescore_factor}")
+
+    rows = run(corpus, queries, args.dimensions, args.precisions, args.k, args.rescore_factor)
+    print(f"{'dims':>5} {'precision':>9} {'rescore':>7} {'memory MB':>10} {'p50 ms':>7} {'p95 ms':>7} {'recall@' + str(args.k):>9}")
+    for row in rows:
+        print(
+            f"{row['dims']:>5} {row['precision']:>9} {str(row['rescore']):>7} {row['memory_mb']:>10.1f} "
+            f"{row['p50_ms']:>7.2f} {row['p95_ms']:>7.2f} {row['recall']:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,97 +1,79 @@
 import streamlit as st
-import fitz  # PyMuPDF for PDF handling
-from pinecone import Pinecone, ServerlessSpec
-from openai import OpenAI
 
-# Ensure you have set your OpenAI API key in the Streamlit secrets
-# You can set it in the Streamlit Cloud or in a .streamlit/secrets.toml file
-api_key = st.secrets["OPENAI_API_KEY"]
+from rag_ingest import ACTIVE_STATES
+from service_client import SERVICE_URL, ServiceClient, ServiceError
 
-# Pinecone setup
-PINECONE_API_KEY = st.secrets["PINECONE_API_KEY"]
-INDEX_NAME = "developer-quickstart-py"
+# Ingestion and retrieval run in the agents service (service/rag.py, "pinecone" store);
+# embedding size and storage precision are configured there.
+@st.cache_resource
+def get_service():
+    return ServiceClient(SERVICE_URL)
 
-# Create Pinecone client
-pc = Pinecone(api_key=PINECONE_API_KEY)
 
-# Create index if not exists
-if INDEX_NAME not in pc.list_indexes().names():
-    pc.create_index(
-        name=INDEX_NAME,
-        dimension=1536,  # for text-embedding-3-small
-        metric="cosine",
-        spec=ServerlessSpec(
-            cloud="aws",
-            region="us-east-1"
-        )
-    )
+service = get_service()
 
+uploaded_files = st.file_uploader("Upload PDF files", type=["pdf"], accept_multiple_files=True)
 
-index = pc.Index(INDEX_NAME)
+# Add chunks to Pinecone in the background
+if uploaded_files and st.button("Process and Store Chunks"):
+    try:
+        for uploaded_file in uploaded_files:
+            service.post(
+                "/rag/pinecone/documents",
+                params={"filename": uploaded_file.name},
+                data=uploaded_file.getvalue(),
+                headers={"Content-Type": "application/pdf"}
+            )
+        st.success(f"Queued {len(uploaded_files)} document(s) for ingestion.")
+    except ServiceError as e:
+        st.error(f"Upload failed: {e}")
+    st.session_state.ingesting = True
 
-uploaded_file = st.file_uploader("Upload a PDF file", type=["pdf"])
-if uploaded_file:
-    # Read PDF and extract text
-    knowledge_base = ""
-    with fitz.open(stream=uploaded_file.read(), filetype="pdf") as doc:
-        for page in doc:
-            knowledge_base += page.get_text()
 
-    st.subheader("Extracted Text Preview")
-    st.write(knowledge_base[:1000] + "...")  # Show first 1000 chars
+def ingestion_status():
+    try:
+        jobs = service.get("/rag/pinecone/jobs")
+    except ServiceError as e:
+        st.error(f"Could not load ingestion jobs: {e}")
+        return
+    # run_every is fixed when the fragment is defined, so a full rerun switches
+    # polling off once nothing is in progress (and back on after a retry)
+    ingesting = any(job["status"] in ACTIVE_STATES for job in jobs)
+    if ingesting != st.session_state.ingesting:
+        st.session_state.ingesting = ingesting
+        st.rerun()
+    if not jobs:
+        return
+    st.subheader("Ingestion Jobs")
+    for job in reversed(jobs):
+        label = f"{job['filename']} - {job['status']} ({job['chunks_done']}/{job['chunks_total']} chunks)"
+        if job["status"] == "failed":
+            st.error(f"{label}: {job['error']}")
+            if st.button("Retry", key=f"retry-{job['job_id']}"):
+                try:
+                    service.post(f"/rag/pinecone/jobs/{job['job_id']}/retry")
+                except ServiceError as e:
+                    st.error(f"Retry failed: {e}")
+                else:
+                    st.session_state.ingesting = True
+                    st.rerun()
+        elif job["status"] == "done":
+            st.write(f"✅ {label}")
+        else:
+            st.progress(job["chunks_done"] / job["chunks_total"] if job["chunks_total"] else 0.0, text=label)
+        if job["preview"]:
+            with st.expander(f"Extracted Text Preview - {job['filename']} (Total chunks: {job['chunks_total']})"):
+                st.write(job["preview"] + "...")
 
-    def fixed_word_chunk(text, chunk_size=20):
-        words = text.split()
-        chunks = []
-        for i in range(0, len(words), chunk_size):
-            chunk = " ".join(words[i:i+chunk_size])
-            chunks.append(chunk)
-        return chunks
 
-    knowledge_chunks = fixed_word_chunk(knowledge_base, chunk_size=20)
-    st.write(f"Total chunks: {len(knowledge_chunks)}")
+st.session_state.setdefault("ingesting", True)
+st.fragment(ingestion_status, run_every=2 if st.session_state.ingesting else None)()
 
-    client = OpenAI(api_key=api_key)
-
-    def get_embedding(text):
-        response = client.embeddings.create(
-            input=text,
-            model="text-embedding-3-small"
-        )
-        return response.data[0].embedding
-
-    # Add chunks to Pinecone
-    if st.button("Process and Store Chunks"):
-        with st.spinner("Embedding and storing chunks..."):
-            vectors = []
-            for i, chunk in enumerate(knowledge_chunks):
-                embedding = get_embedding(chunk)
-                vectors.append((
-                    f"chunk-{i+1}",
-                    embedding,
-                    {"text": chunk}
-                ))
-            index.upsert(vectors)
-        st.success("Chunks processed and stored!")
-
-    query = st.text_input("Enter your query")
-    if query and st.button("Ask"):
-        query_embedding = get_embedding(query)
-        # Query Pinecone for top 2 matches
-        results = index.query(
-            vector=query_embedding,
-            top_k=2,
-            include_metadata=True
-        )
-        top_chunks = [match['metadata']['text'] for match in results['matches']]
-        top_chunks_str = ", ".join(top_chunks)
-
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[{
-                "role": "user",
-                "content": f"You are a very good writer, who writes very good documents. Given {top_chunks_str} and {query}, give me a good answer, keep human touch."
-            }]
-        )
-        st.subheader("RAG Response")
-        st.write(response.choices[0].message.content)
\ No newline at end of file
+# Queries run against whatever is already indexed, even while other documents ingest
+query = st.text_input("Enter your query")
+if query and st.button("Ask"):
+    st.subheader("RAG Response")
+    try:
+        st.write_stream(service.stream_text("/rag/pinecone/query", {"query": query}))
+    except ServiceError as e:
+        st.error(f"Query failed: {e}")
@@ -1,78 +1,81 @@
 import streamlit as st
-import fitz  # PyMuPDF for PDF handling
-import chromadb
-from chromadb.config import Settings
-from openai import OpenAI
 
+from rag_ingest import ACTIVE_STATES
+from service_client import SERVICE_URL, ServiceClient, ServiceError
 
-# Ensure you have set your OpenAI API key in the Streamlit secrets
-# You can set it in the Streamlit Cloud or in a .streamlit/secrets.toml file
-api_key = st.secrets["OPENAI_API_KEY"]
+# Ingestion and retrieval run in the agents service (service/rag.py, "chroma" store);
+# embedding size and storage precision are configured there.
+@st.cache_resource
+def get_service():
+    return ServiceClient(SERVICE_URL)
 
-st.title("PS Week 3 Day 5 - RAG App")
-
-uploaded_file = st.file_uploader("Upload a PDF file", type=["pdf"])
-if uploaded_file:
-    # Read PDF and extract text
-    knowledge_base = ""
-    with fitz.open(stream=uploaded_file.read(), filetype="pdf") as doc:
-        for page in doc:
-            knowledge_base += page.get_text()
 
-    st.subheader("Extracted Text Preview")
-    st.write(knowledge_base[:1000] + "...")  # Show first 1000 chars
+service = get_service()
 
-    def fixed_word_chunk(text, chunk_size=20):
-        words = text.split()
-        chunks = []
-        for i in range(0, len(words), chunk_size):
-            chunk = " ".join(words[i:i+chunk_size])
-            chunks.append(chunk)
-        return chunks
+st.title("PS Week 3 Day 5 - RAG App")
 
-    knowledge_chunks = fixed_word_chunk(knowledge_base, chunk_size=20)
-    st.write(f"Total chunks: {len(knowledge_chunks)}")
+uploaded_files = st.file_uploader("Upload PDF files", type=["pdf"], accept_multiple_files=True)
 
-    client = OpenAI(api_key=api_key)
+# Add chunks to ChromaDB in the background
+if uploaded_files and st.button("Process and Store Chunks"):
+    try:
+        for uploaded_file in uploaded_files:
+            service.post(
+                "/rag/chroma/documents",
+                params={"filename": uploaded_file.name},
+                data=uploaded_file.getvalue(),
+                headers={"Content-Type": "application/pdf"}
+            )
+        st.success(f"Queued {len(uploaded_files)} document(s) for ingestion.")
+    except ServiceError as e:
+        st.error(f"Upload failed: {e}")
+    st.session_state.ingesting = True
 
-    def get_embedding(text):
-        response = client.embeddings.create(
-            input=text,
-            model="text-embedding-3-small"
-        )
-        return response.data[0].embedding
 
-    # Setup ChromaDB client
-    chroma_client = chromadb.Client(Settings(
-	persist_directory='./chrome_store',
-	database_impl="duckdb+parquet"
-	))
-    collection = chroma_client.get_or_create_collection(name="my_kb")
+def ingestion_status():
+    try:
+        jobs = service.get("/rag/chroma/jobs")
+    except ServiceError as e:
+        st.error(f"Could not load ingestion jobs: {e}")
+        return
+    # run_every is fixed when the fragment is defined, so a full rerun switches
+    # polling off once nothing is in progress (and back on after a retry)
+    ingesting = any(job["status"] in ACTIVE_STATES for job in jobs)
+    if ingesting != st.session_state.ingesting:
+        st.session_state.ingesting = ingesting
+        st.rerun()
+    if not jobs:
+        return
+    st.subheader("Ingestion Jobs")
+    for job in reversed(jobs):
+        label = f"{job['filename']} - {job['status']} ({job['chunks_done']}/{job['chunks_total']} chunks)"
+        if job["status"] == "failed":
+            st.error(f"{label}: {job['error']}")
+            if st.button("Retry", key=f"retry-{job['job_id']}"):
+                try:
+                    service.post(f"/rag/chroma/jobs/{job['job_id']}/retry")
+                except ServiceError as e:
+                    st.error(f"Retry failed: {e}")
+                else:
+                    st.session_state.ingesting = True
+                    st.rerun()
+        elif job["status"] == "done":
+            st.write(f"✅ {label}")
+        else:
+            st.progress(job["chunks_done"] / job["chunks_total"] if job["chunks_total"] else 0.0, text=label)
+        if job["preview"]:
+            with st.expander(f"Extracted Text Preview - {job['filename']} (Total chunks: {job['chunks_total']})"):
+                st.write(job["preview"] + "...")
 
-    # Add chunks to ChromaDB
-    if st.button("Process and Store Chunks"):
-        with st.spinner("Embedding and storing chunks..."):
-            for i, chunk in enumerate(knowledge_chunks):
-                collection.add(
-                    ids=[f"chunk-{i+1}"],
-                    documents=[chunk],
-                    embeddings=[get_embedding(chunk)]
-                )
-        st.success("Chunks processed and stored!")
 
-    query = st.text_input("Enter your query")
-    if query and st.button("Ask"):
-        query_embedding = get_embedding(query)
-        results = collection.query(query_embeddings=[query_embedding], n_results=2)
-        top_chunks = results['documents'][0]
-        top_chunks_str = ", ".join(top_chunks)
+st.session_state.setdefault("ingesting", True)
+st.fragment(ingestion_status, run_every=2 if st.session_state.ingesting else None)()
 
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[{
-                "role": "user",
-                "content": f"You are a very good writer, who writes very good documents. Given {top_chunks_str} and {query}, give me a good answer, keep human touch."
-            }]
-        )
-        st.subheader("RAG Response")
-        st.write(response.choices[0].message.content)
\ No newline at end of file
+# Queries run against whatever is already indexed, even while other documents ingest
+query = st.text_input("Enter your query")
+if query and st.button("Ask"):
+    st.subheader("RAG Response")
+    try:
+        st.write_stream(service.stream_text("/rag/chroma/query", {"query": query}))
+    except ServiceError as e:
+        st.error(f"Query failed: {e}")
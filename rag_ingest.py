@@ -0,0 +1,181 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from vector_store import lock_directory
+
+# ----------------------------
+# Background PDF ingestion shared by the RAG apps
+# ----------------------------
+# Jobs run extract -> chunk -> embed -> upsert on a worker pool owned by the process,
+# so a large PDF never blocks the Streamlit script thread and closing the tab does not
+# lose the work. Job state lives in SQLite and the uploaded bytes are spooled to disk,
+# so unfinished jobs are picked up again after a restart. A state directory belongs to
+# one process at a time, otherwise every process would resume (and re-run) the same jobs.
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIMENSIONS = 1536  # native size; the model can return shorter vectors via `dimensions`
+EMBED_BATCH_SIZE = 64
+PREVIEW_CHARS = 1000
+
+ACTIVE_STATES = ("queued", "extracting", "embedding")
+
+
+def extract_pdf_text(pdf_bytes):
+    import fitz  # PyMuPDF for PDF handling, imported lazily (slow to load)
+
+    knowledge_base = ""
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        for page in doc:
+            knowledge_base += page.get_text()
+    return knowledge_base
+
+
+def fixed_word_chunk(text, chunk_size=20):
+    words = text.split()
+    chunks = []
+    for i in range(0, len(words), chunk_size):
+        chunk = " ".join(words[i:i+chunk_size])
+        chunks.append(chunk)
+    return chunks
+
+
+def embed_texts(client, texts, dimensions=EMBEDDING_DIMENSIONS):
+    # One request per batch instead of one per chunk
+    response = client.embeddings.create(
+        input=texts,
+        model=EMBEDDING_MODEL,
+        dimensions=dimensions
+    )
+    return [item.embedding for item in response.data]
+
+
+class IngestQueue:
+    def __init__(self, client, upsert, state_dir, max_workers=2, chunk_size=20, dimensions=EMBEDDING_DIMENSIONS):
+        # upsert(ids, chunks, embeddings, source) writes one batch to the vector store
+        self.client = client
+        self.upsert = upsert
+        self.chunk_size = chunk_size
+        self.dimensions = dimensions
+        self.db_path = os.path.join(state_dir, "jobs.db")
+        self.spool_dir = os.path.join(state_dir, "spool")
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self._lock_file = lock_directory(state_dir)
+
+        self._lock = threading.Lock()
+        self._init_db()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        self._resume()
+
+    # ---------------- Job state ---------------- #
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    filename TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    chunks_done INTEGER NOT NULL DEFAULT 0,
+                    chunks_total INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            # State directories created before the text preview was stored
+            columns = [row["name"] for row in conn.execute("PRAGMA table_info(jobs)")]
+            if "preview" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN preview TEXT")
+
+    def _update(self, job_id, **fields):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?", [*fields.values(), job_id])
+
+    def jobs(self):
+        with self._lock, self._connect() as conn:
+            rows = conn.execute("SELECT * FROM jobs ORDER BY created_at").fetchall()
+        return [dict(row) for row in rows]
+
+    # ---------------- Submission ---------------- #
+    def submit(self, filename, pdf_bytes):
+        job_id = uuid.uuid4().hex[:12]
+        with open(self._spool_path(job_id), "wb") as f:
+            f.write(pdf_bytes)
+
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, filename, status, created_at, updated_at) VALUES (?, ?, 'queued', ?, ?)",
+                (job_id, filename, now, now)
+            )
+        self._pool.submit(self._run, job_id, filename)
+        return job_id
+
+    def retry(self, job_id):
+        # Failed jobs keep their spooled upload and pick up again from chunks_done
+        if not os.path.exists(self._spool_path(job_id)):
+            return False
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT filename FROM jobs WHERE job_id = ? AND status = 'failed'", (job_id,)).fetchone()
+            if row is None:
+                return False
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', error = NULL, updated_at = ? WHERE job_id = ?",
+                (time.time(), job_id)
+            )
+        self._pool.submit(self._run, job_id, row["filename"])
+        return True
+
+    def _resume(self):
+        # Re-queue anything a previous process left unfinished; chunk ids are
+        # deterministic, so re-upserting an already written batch is harmless.
+        for job in self.jobs():
+            if job["status"] in ACTIVE_STATES:
+                if os.path.exists(self._spool_path(job["job_id"])):
+                    self._update(job["job_id"], status="queued")
+                    self._pool.submit(self._run, job["job_id"], job["filename"])
+                else:
+                    self._update(job["job_id"], status="failed", error="Uploaded file is no longer available.")
+
+    def _spool_path(self, job_id):
+        return os.path.join(self.spool_dir, f"{job_id}.pdf")
+
+    # ---------------- Worker ---------------- #
+    def _run(self, job_id, filename):
+        try:
+            self._update(job_id, status="extracting")
+            with open(self._spool_path(job_id), "rb") as f:
+                knowledge_base = extract_pdf_text(f.read())
+            knowledge_chunks = fixed_word_chunk(knowledge_base, chunk_size=self.chunk_size)
+            self._update(job_id, preview=knowledge_base[:PREVIEW_CHARS])
+
+            # A retried or resumed job skips the batches it already wrote
+            with self._lock, self._connect() as conn:
+                chunks_done = conn.execute("SELECT chunks_done FROM jobs WHERE job_id = ?", (job_id,)).fetchone()[0]
+            self._update(job_id, status="embedding", chunks_total=len(knowledge_chunks))
+            for start in range(chunks_done, len(knowledge_chunks), EMBED_BATCH_SIZE):
+                batch = knowledge_chunks[start:start+EMBED_BATCH_SIZE]
+                ids = [f"{job_id}-chunk-{start+i+1}" for i in range(len(batch))]
+                self.upsert(ids, batch, embed_texts(self.client, batch, self.dimensions), filename)
+                self._update(job_id, chunks_done=start + len(batch))
+
+            self._update(job_id, status="done")
+        except Exception as e:
+            # The spool file stays behind so retry() can finish the job; the batches
+            # already written remain searchable in the meantime
+            self._update(job_id, status="failed", error=str(e))
+            return
+        try:
+            os.remove(self._spool_path(job_id))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,5 @@
+from dotenv import load_dotenv
+
+# Several modules read settings at import time (service.models, service.rag), so a
+# .env file has to be loaded before any of them is imported.
+load_dotenv()
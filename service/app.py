@@ -0,0 +1,191 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from service import botdesk, medic, rag, reviews, triage, websearch
+from service.clients import close_clients
+from service.models import model_stats
+
+# ----------------------------
+# Async HTTP service for the agents
+# ----------------------------
+# Run with:  uvicorn service.app:app --host 0.0.0.0 --port 8000
+# Run it as a single process (no --workers): the ingest job queues and the quantized
+# vector store keep their state in this process and lock their directories, so a
+# second worker fails on its first RAG request instead of corrupting them.
+# Single answers stream back as plain text; multi-stage pipelines stream one JSON
+# event per line (NDJSON) as each stage finishes.
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await close_clients()
+
+
+app = FastAPI(title="PS Agents Service", lifespan=lifespan)
+
+
+async def stream_text(chunks):
+    # The upstream call only starts on first iteration, so pull the first chunk before
+    # sending headers: setup failures (bad key, 429, network) become a 502 instead of
+    # a truncated body
+    try:
+        first = await anext(chunks, "")
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Upstream model call failed: {e}")
+
+    async def text():
+        yield first
+        async for chunk in chunks:
+            yield chunk
+    return StreamingResponse(text(), media_type="text/plain; charset=utf-8")
+
+
+def stream_events(events):
+    async def lines():
+        # Headers are already sent once streaming starts, so failures become an event
+        try:
+            async for event in events:
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            yield json.dumps({"event": "error", "detail": str(e)}) + "\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+# ---------------- BotDesk ---------------- #
+class SupportRequest(BaseModel):
+    action: str
+    email: str
+    order_id: str | None = None
+    message: str
+
+
+@app.get("/botdesk/orders")
+async def botdesk_orders(email: str):
+    return botdesk.find_orders(email)
+
+
+@app.post("/botdesk/support")
+async def botdesk_support(request: SupportRequest):
+    if not request.message.strip():
+        raise HTTPException(status_code=422, detail="Please enter a query.")
+    order = None
+    if request.action != "General Support":
+        order = botdesk.find_order(request.email, request.order_id)
+        if order is None:
+            raise HTTPException(status_code=404, detail="No such order for this email.")
+    try:
+        chunks = botdesk.support_agent(request.action, order, request.email, request.message)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return await stream_text(chunks)
+
+
+@app.post("/botdesk/bulk")
+async def botdesk_bulk(request: Request, concurrency: int = 16):
+    # NDJSON tickets in, NDJSON responses streamed back as each ticket completes.
+    # The body is read up front: once a StreamingResponse starts it owns receive().
+    body = await request.body()
+
+    async def tickets():
+        for line_number, line in enumerate(body.splitlines(), start=1):
+            if line.strip():
+                ticket = triage.parse_ticket(line, line_number)
+                ticket.setdefault("ticket_id", line_number)
+                yield ticket
+
+    return stream_events(triage.triage_tickets(tickets(), min(max(concurrency, 1), 64)))
+
+
+# ---------------- RAG ---------------- #
+class QueryRequest(BaseModel):
+    query: str
+
+
+def check_backend(backend):
+    if backend not in rag.BACKENDS:
+        raise HTTPException(status_code=404, detail=f"Unknown vector store: {backend}")
+
+
+@app.post("/rag/{backend}/documents")
+async def rag_ingest(backend: str, filename: str, request: Request):
+    # Raw PDF bytes in the body; ingestion runs on the background job queue
+    check_backend(backend)
+    pdf_bytes = await request.body()
+    ingest_queue = await asyncio.to_thread(rag.get_ingest_queue, backend)
+    job_id = await asyncio.to_thread(ingest_queue.submit, filename, pdf_bytes)
+    return {"job_id": job_id}
+
+
+@app.get("/rag/{backend}/jobs")
+async def rag_jobs(backend: str):
+    check_backend(backend)
+    ingest_queue = await asyncio.to_thread(rag.get_ingest_queue, backend)
+    return await asyncio.to_thread(ingest_queue.jobs)
+
+
+@app.post("/rag/{backend}/jobs/{job_id}/retry")
+async def rag_retry(backend: str, job_id: str):
+    check_backend(backend)
+    ingest_queue = await asyncio.to_thread(rag.get_ingest_queue, backend)
+    if not await asyncio.to_thread(ingest_queue.retry, job_id):
+        raise HTTPException(status_code=409, detail="Only a failed job with its upload still on disk can be retried.")
+    return {"job_id": job_id}
+
+
+@app.post("/rag/{backend}/query")
+async def rag_query(backend: str, request: QueryRequest):
+    check_backend(backend)
+    return await stream_text(await rag.answer_query(backend, request.query))
+
+
+# ---------------- Medic ---------------- #
+class DiagnosticsRequest(BaseModel):
+    patient_input: str
+
+
+@app.post("/medic/diagnostics")
+async def medic_diagnostics(request: DiagnosticsRequest):
+    return stream_events(medic.run_diagnostics(request.patient_input))
+
+
+# ---------------- Reviews ---------------- #
+class ReviewsRequest(BaseModel):
+    product_reviews: list | dict
+
+
+@app.post("/reviews/analysis")
+async def reviews_analysis(request: ReviewsRequest):
+    return stream_events(reviews.run_analysis(request.product_reviews))
+
+
+# ---------------- WebsearchTool ---------------- #
+class WebsearchRequest(BaseModel):
+    user_input: str
+
+
+@app.post("/websearch/search")
+async def websearch_search(request: WebsearchRequest):
+    return {"result": await websearch.web_search(request.user_input)}
+
+
+@app.post("/websearch/weather")
+async def websearch_weather(request: WebsearchRequest):
+    return {"result": await websearch.get_weather(request.user_input)}
+
+
+@app.post("/websearch/smart")
+async def websearch_smart(request: WebsearchRequest):
+    return await stream_text(websearch.smart_query(request.user_input))
+
+
+# ---------------- Model tiering ---------------- #
+@app.get("/metrics/models")
+async def metrics_models():
+    # Per-stage latency and token spend for each tier, to tune STAGE_TIERS
+    return model_stats()
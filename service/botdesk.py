@@ -0,0 +1,171 @@
+from service.clients import stream_llm
+
+# -----------------------------
+# Mock Order Database
+# -----------------------------
+ORDER_DB = {
+    "john@example.com": [
+        {
+            "order_id": "ORD12345",
+            "status": "Out for Delivery",
+            "expected_delivery": "2025-07-06",
+            "carrier": "BlueDart",
+            "tracking_link": "https://track.bluedart.com/ORD12345",
+            "amount": 1299
+        },
+        {
+            "order_id": "ORD11111",
+            "status": "Shipped",
+            "expected_delivery": "2025-07-08",
+            "carrier": "Delhivery",
+            "tracking_link": "https://track.delhivery.com/ORD11111",
+            "amount": 899
+        }
+    ],
+    "alice@example.com": [
+        {
+            "order_id": "ORD67890",
+            "status": "Shipped",
+            "expected_delivery": "2025-07-08",
+            "carrier": "Delhivery",
+            "tracking_link": "https://track.delhivery.com/ORD67890",
+            "amount": 899
+        }
+    ],
+    "bob@example.com": [
+        {
+            "order_id": "ORD54321",
+            "status": "Delivered",
+            "expected_delivery": "2025-07-02",
+            "carrier": "Xpressbees",
+            "tracking_link": "https://xpressbees.com/track/ORD54321",
+            "amount": 1549
+        }
+    ],
+    "sara@example.com": [
+        {
+            "order_id": "ORD98765",
+            "status": "Processing",
+            "expected_delivery": "2025-07-10",
+            "carrier": "Ecom Express",
+            "tracking_link": "https://ecomexpress.in/track/ORD98765",
+            "amount": 2199
+        }
+    ]
+}
+
+
+def find_orders(user_email):
+    return ORDER_DB.get(user_email, [])
+
+
+def find_orders_many(user_emails):
+    # One lookup per batch of tickets, the shape of a real `WHERE email IN (...)` query
+    return {user_email: ORDER_DB.get(user_email, []) for user_email in user_emails}
+
+
+def find_order(user_email, order_id):
+    for order in find_orders(user_email):
+        if order["order_id"] == order_id:
+            return order
+    return None
+
+
+# -----------------------------
+# Agent Functions
+# -----------------------------
+# Each agent returns an async iterator of response text, streamed from the model
+def order_tracking_agent(order, user_prompt):
+    prompt = f"""
+    You are a friendly and helpful customer support assistant.
+
+    A customer asked: "{user_prompt.strip()}"
+
+    Their order details:
+    - Order ID: {order['order_id']}
+    - Status: {order['status']}
+    - Carrier: {order['carrier']}
+    - Expected Delivery: {order['expected_delivery']}
+    - Amount: ₹{order['amount']}
+    - Tracking Link: {order['tracking_link']}
+
+    Write a warm, natural response:
+    - Acknowledge the question
+    - Answer using order info
+    - Provide tracking link & delivery timeline
+    - Be conversational and supportive
+    """
+    return stream_llm(prompt, "botdesk.order_tracking")
+
+
+def return_agent(order, user_email, user_prompt):
+    prompt = f"""
+    You are a helpful, empathetic customer support assistant in a live chat.
+
+    Customer message: "{user_prompt.strip()}"
+
+    Order details:
+    - Order ID: {order['order_id']}
+    - Status: {order['status']}
+    - Expected Delivery: {order['expected_delivery']}
+    - Refund Amount: ₹{order['amount']}
+    - Carrier: {order['carrier']}
+    - Tracking: {order['tracking_link']}
+    - Email: {user_email}
+
+    If delivered → confirm return scheduled for pickup tomorrow, refund after pickup.
+    If not delivered → explain returns can only start after delivery, share current status + expected delivery, reassure them.
+
+    Keep it short, chat-style, and human.
+    """
+    return stream_llm(prompt, "botdesk.return")
+
+
+def refund_agent(order, user_email, user_prompt):
+    prompt = f"""
+    You are a supportive customer support assistant.
+
+    Customer request: "{user_prompt.strip()}"
+
+    Order details:
+    - Order ID: {order['order_id']}
+    - Status: {order['status']}
+    - Expected Delivery: {order['expected_delivery']}
+    - Refund Amount: ₹{order['amount']}
+    - Carrier: {order['carrier']}
+    - Tracking: {order['tracking_link']}
+    - Email: {user_email}
+
+    If delivered → confirm refund initiated, when money arrives, mention confirmation email sent.
+    If not delivered → explain refund policy, current delivery status & tracking, reassure support.
+
+    Write warm, friendly, chat-style response.
+    """
+    return stream_llm(prompt, "botdesk.refund")
+
+
+def general_support_agent(user_prompt):
+    prompt = f"""
+    You are a friendly and professional customer support assistant.
+
+    Customer query: "{user_prompt.strip()}"
+
+    Write a short, conversational response:
+    - Acknowledge query
+    - Confirm it has been received
+    - Offer contact options if urgent
+    - Keep it warm and human
+    """
+    return stream_llm(prompt, "botdesk.general_support")
+
+
+def support_agent(action, order, user_email, user_prompt):
+    if action == "Track Order":
+        return order_tracking_agent(order, user_prompt)
+    elif action == "Return Order":
+        return return_agent(order, user_email, user_prompt)
+    elif action == "Refund":
+        return refund_agent(order, user_email, user_prompt)
+    elif action == "General Support":
+        return general_support_agent(user_prompt)
+    raise ValueError(f"Unknown action: {action}")
@@ -0,0 +1,108 @@
+import os
+import time
+
+import httpx
+from openai import AsyncOpenAI
+
+from service.models import MODEL_TIERS, record_call, record_validation_failure, tiers_for
+
+# ----------------------------
+# Shared clients for the service
+# ----------------------------
+# One AsyncOpenAI client and one httpx pool per process, shared by every request, so
+# concurrent requests reuse keep-alive connections instead of opening their own.
+# Keys come from the environment (or a .env file, loaded in service/__init__.py)
+# instead of st.secrets.
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 100))
+
+_openai_client = None
+_http_client = None
+
+
+def get_openai_client():
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _openai_client
+
+
+def get_http_client():
+    # Used for the non-OpenAI tools (weather, Tavily search)
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=20),
+            timeout=httpx.Timeout(60.0, connect=10.0)
+        )
+    return _http_client
+
+
+async def close_clients():
+    global _openai_client, _http_client
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def create_completion(stage, messages, parse=None, **kwargs):
+    # Runs the stage on its tier's model and returns parse(response) (or the response).
+    # If parse raises, the call is retried on the next tier up, and the last error is
+    # re-raised once no tier is left.
+    error = None
+    for tier in tiers_for(stage):
+        start = time.perf_counter()
+        response = await get_openai_client().chat.completions.create(
+            model=MODEL_TIERS[tier],
+            messages=messages,
+            **kwargs
+        )
+        record_call(stage, tier, time.perf_counter() - start, response.usage)
+        if parse is None:
+            return response
+        try:
+            return parse(response)
+        except Exception as e:
+            record_validation_failure(stage, tier)
+            error = e
+    raise error
+
+
+async def stream_completion(stage, messages, **kwargs):
+    # Streamed output can't be validated before the client sees it, so no escalation here
+    tier = tiers_for(stage)[0]
+    start = time.perf_counter()
+    usage = None
+    try:
+        stream = await get_openai_client().chat.completions.create(
+            model=MODEL_TIERS[tier],
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            **kwargs
+        )
+        async for chunk in stream:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        # Also record calls cut short by a client disconnect or a failed stream; usage
+        # only arrives in the last chunk, so those count latency without tokens
+        record_call(stage, tier, time.perf_counter() - start, usage)
+
+
+async def ask_llm(prompt, stage, parse=None):
+    # parse(content) validates and converts the reply, e.g. json.loads
+    def parse_content(response):
+        content = response.choices[0].message.content
+        return parse(content) if parse else content
+
+    return await create_completion(stage, [{"role": "user", "content": prompt}], parse_content)
+
+
+def stream_llm(prompt, stage):
+    return stream_completion(stage, [{"role": "user", "content": prompt}])
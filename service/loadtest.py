@@ -0,0 +1,105 @@
+# Concurrent-request load test for the agents service.
+#
+#   uvicorn service.app:app --port 8000
+#   python -m service.loadtest --scenario botdesk --requests 200 --concurrency 1 10 50
+#
+# Every request reads its streamed response to the end; latency is measured to the
+# last byte, time-to-first-byte separately. A pipeline that ends in an error event
+# counts as an error, not as throughput.
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+import numpy as np
+
+SCENARIOS = {
+    "botdesk": ("/botdesk/support", {
+        "action": "Track Order",
+        "email": "john@example.com",
+        "order_id": "ORD12345",
+        "message": "Where is my order?"
+    }),
+    "botdesk-general": ("/botdesk/support", {
+        "action": "General Support",
+        "email": "john@example.com",
+        "message": "Do you ship internationally?"
+    }),
+    "rag-chroma": ("/rag/chroma/query", {"query": "What is this document about?"}),
+    "rag-pinecone": ("/rag/pinecone/query", {"query": "What is this document about?"}),
+    "medic": ("/medic/diagnostics", {"patient_input": "Chest pain when breathing deeply, fatigue, shortness of breath."}),
+    "reviews": ("/reviews/analysis", {"product_reviews": ["Great battery life.", "Screen scratches easily."]}),
+    "websearch": ("/websearch/smart", {"user_input": "What's the weather in Delhi?"}),
+}
+
+
+async def one_request(client, path, payload):
+    start = time.perf_counter()
+    first_byte = None
+    async with client.stream("POST", path, json=payload) as response:
+        # Event routes report a failed pipeline as a final {"event": "error"} line with a 200
+        events = response.headers.get("content-type", "").startswith("application/x-ndjson")
+        last_line = ""
+        async for chunk in (response.aiter_lines() if events else response.aiter_bytes()):
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            if events and chunk.strip():
+                last_line = chunk
+        ok = response.status_code == 200
+    if ok and last_line:
+        ok = json.loads(last_line).get("event") != "error"
+    return ok, first_byte or 0.0, time.perf_counter() - start
+
+
+async def run(base_url, path, payload, n_requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300) as client:
+        async def bounded():
+            async with semaphore:
+                try:
+                    return await one_request(client, path, payload)
+                except (httpx.HTTPError, ValueError):
+                    return False, 0.0, 0.0
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(bounded() for _ in range(n_requests)))
+        elapsed = time.perf_counter() - start
+
+    ok = [r for r in results if r[0]]
+    ttfb = np.array([r[1] for r in ok]) * 1000
+    latency = np.array([r[2] for r in ok]) * 1000
+    return {
+        "concurrency": concurrency,
+        "requests": n_requests,
+        "errors": n_requests - len(ok),
+        "throughput": len(ok) / elapsed,
+        "ttfb_p50": np.percentile(ttfb, 50) if len(ok) else 0.0,
+        "p50": np.percentile(latency, 50) if len(ok) else 0.0,
+        "p95": np.percentile(latency, 95) if len(ok) else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the agents service")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="botdesk")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+
+    path, payload = SCENARIOS[args.scenario]
+    print(f"scenario={args.scenario} POST {args.url}{path}")
+    print(f"{'conc':>5} {'reqs':>5} {'errors':>6} {'req/s':>8} {'ttfb p50':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for concurrency in args.concurrency:
+        row = asyncio.run(run(args.url, path, payload, args.requests, concurrency))
+        print(
+            f"{row['concurrency']:>5} {row['requests']:>5} {row['errors']:>6} {row['throughput']:>8.1f} "
+            f"{row['ttfb_p50']:>9.0f} {row['p50']:>8.0f} {row['p95']:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import json
+import re
+
+from service.clients import ask_llm
+
+
+# ----------------------------
+# Agent 1: Planning Agent
+# ----------------------------
+def parse_plan(content):
+    # Raises on anything run_diagnostics can't walk through, so the call escalates to
+    # the next tier instead of failing after the plan event has been sent
+    text = content.strip()
+    fenced = re.fullmatch(r"```(?:json)?\s*(.*?)\s*```", text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1)
+    steps = json.loads(text)
+    if not isinstance(steps, list) or not steps:
+        raise ValueError("Diagnostic plan must be a non-empty JSON array.")
+    for step in steps:
+        if not isinstance(step, dict) or "step_number" not in step or not isinstance(step.get("instruction"), str):
+            raise ValueError(f"Plan step needs a step_number and an instruction: {step!r}")
+    return steps
+
+
+async def get_diagnostic_plan(patient_input):
+    prompt = f"""         
+You are a medical planning agent. Based solely on the information provided below — 
+without the patient being physically present — break down the case into a clear, medically sound diagnostic plan.
+
+Return the output as a JSON array of objects.
+
+Each object must contain:
+- "step_number": the step number
+- "instruction": an actionable diagnostic or evaluation step.
+
+Patient Data:
+{patient_input}
+"""
+    # A reply that isn't a valid plan is retried on the next model tier up
+    return await ask_llm(prompt, "medic.plan", parse=parse_plan)
+
+
+# ----------------------------
+# Agent 2: Worker Agent
+# ----------------------------
+async def perform_diagnostic_step(step, accumulated_context):
+    prompt = f"""
+You are a medical assistant AI. Execute the following diagnostic instruction:
+
+Instruction: {step['instruction']}
+
+Patient context so far:
+{accumulated_context}
+
+Respond with the output of this step in clearly formatted text or JSON.
+"""
+    step_output = await ask_llm(prompt, "medic.step")
+    return step_output
+
+
+# ----------------------------
+# Agent 3: Orchestrator Agent
+# ----------------------------
+async def create_diagnostic_summary(diagnostic_outputs, patient_input):
+    prompt = f"""
+You are a medical orchestrator AI. The user has input: {patient_input}
+You received the following results from medical worker agents:
+
+{diagnostic_outputs}
+
+Synthesize a final diagnostic summary that:
+- Interprets all findings
+- Lists suspected diseases
+- Suggests tests
+- Advises next medical steps
+
+Respond in clear bullet points.
+"""
+    return await ask_llm(prompt, "medic.summary")
+
+
+async def run_diagnostics(patient_input):
+    # Yields one event per stage so clients can render results as they arrive.
+    # Steps stay sequential: each worker sees the results of the steps before it.
+    diagnostic_steps = await get_diagnostic_plan(patient_input)
+    yield {"event": "plan", "diagnostic_steps": diagnostic_steps}
+
+    accumulated_context = {"patient_input": patient_input}
+    step_results = []
+    for step in diagnostic_steps:
+        result = await perform_diagnostic_step(step, accumulated_context)
+        step_results.append({"step": step, "result": result})
+        accumulated_context[f"Step{step['step_number']}"] = result
+        yield {"event": "step", "step": step, "result": result}
+
+    final_summary = await create_diagnostic_summary(step_results, patient_input)
+    yield {"event": "summary", "final_summary": final_summary}
@@ -0,0 +1,104 @@
+import json
+import os
+from collections import defaultdict, deque
+
+import numpy as np
+
+# ----------------------------
+# Model tiering for the pipeline stages
+# ----------------------------
+# Every LLM call names its stage; the stage maps to a tier and the tier to a model.
+# Cheap, high-volume stages start on the small tier, and a call whose output fails
+# validation is retried one tier up (see clients.create_completion).
+# Both tables can be overridden with JSON in the environment, e.g.
+#   MODEL_TIERS='{"small": "gpt-4o-mini", "large": "gpt-4o"}'
+#   STAGE_TIERS='{"medic.summary": "small"}'
+
+TIER_ORDER = ["small", "large"]
+
+MODEL_TIERS = {
+    "small": "gpt-4o-mini",
+    "large": "gpt-4",
+}
+MODEL_TIERS.update(json.loads(os.getenv("MODEL_TIERS", "{}")))
+
+DEFAULT_TIER = "large"
+
+STAGE_TIERS = {
+    "botdesk.order_tracking": "large",
+    "botdesk.return": "large",
+    "botdesk.refund": "large",
+    "botdesk.general_support": "small",
+    "medic.plan": "small",  # the plan is parsed as JSON, so bad output escalates
+    "medic.step": "small",
+    "medic.summary": "large",
+    "reviews.extract_pros_cons": "small",
+    "reviews.group_feedback": "large",
+    "reviews.summary": "large",
+    "websearch.tool_selection": "small",
+    "websearch.answer": "large",
+    "rag.answer": "large",
+}
+_stage_overrides = json.loads(os.getenv("STAGE_TIERS", "{}"))
+
+# Fail at startup on a bad override rather than ignoring it or failing on every call
+_unknown_stages = sorted(set(_stage_overrides) - set(STAGE_TIERS))
+if _unknown_stages:
+    raise ValueError(f"STAGE_TIERS names unknown stages {_unknown_stages}, expected some of {sorted(STAGE_TIERS)}")
+STAGE_TIERS.update(_stage_overrides)
+
+_missing = [tier for tier in TIER_ORDER if not MODEL_TIERS.get(tier)]
+if _missing:
+    raise ValueError(f"MODEL_TIERS has no model for tiers {_missing}")
+_unknown = {stage: tier for stage, tier in STAGE_TIERS.items() if tier not in TIER_ORDER}
+if _unknown:
+    raise ValueError(f"STAGE_TIERS names unknown tiers {_unknown}, expected one of {TIER_ORDER}")
+
+
+def tiers_for(stage):
+    # The stage's own tier first, then every tier above it to escalate through
+    tier = STAGE_TIERS.get(stage, DEFAULT_TIER)
+    return TIER_ORDER[TIER_ORDER.index(tier):]
+
+
+# ---------------- Per-stage metrics ---------------- #
+LATENCY_WINDOW = 1000
+
+_stats = defaultdict(lambda: {
+    "calls": 0,
+    "validation_failures": 0,
+    "prompt_tokens": 0,
+    "completion_tokens": 0,
+    "latencies": deque(maxlen=LATENCY_WINDOW),
+})
+
+
+def record_call(stage, tier, latency, usage):
+    stats = _stats[(stage, tier)]
+    stats["calls"] += 1
+    stats["latencies"].append(latency)
+    if usage is not None:
+        stats["prompt_tokens"] += usage.prompt_tokens
+        stats["completion_tokens"] += usage.completion_tokens
+
+
+def record_validation_failure(stage, tier):
+    _stats[(stage, tier)]["validation_failures"] += 1
+
+
+def model_stats():
+    rows = []
+    for (stage, tier), stats in sorted(_stats.items()):
+        latencies = np.array(stats["latencies"]) * 1000
+        rows.append({
+            "stage": stage,
+            "tier": tier,
+            "model": MODEL_TIERS[tier],
+            "calls": stats["calls"],
+            "validation_failures": stats["validation_failures"],
+            "prompt_tokens": stats["prompt_tokens"],
+            "completion_tokens": stats["completion_tokens"],
+            "latency_p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else None,
+            "latency_p95_ms": float(np.percentile(latencies, 95)) if len(latencies) else None,
+        })
+    return {"model_tiers": MODEL_TIERS, "stage_tiers": STAGE_TIERS, "stages": rows}
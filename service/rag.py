@@ -0,0 +1,137 @@
+import asyncio
+import os
+import threading
+
+from openai import OpenAI
+
+from rag_ingest import EMBEDDING_DIMENSIONS, EMBEDDING_MODEL, IngestQueue
+from service.clients import get_openai_client, stream_llm
+
+# Storage tuning, see bench_embeddings.py: shorter embeddings for both stores, and
+# float16/int8 storage (with full-precision rescoring) in place of Chroma
+DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", EMBEDDING_DIMENSIONS))
+PRECISION = os.getenv("VECTOR_PRECISION", "float32")
+
+PINECONE_INDEX_NAME = "developer-quickstart-py"
+
+
+# ----------------------------
+# Vector store backends
+# ----------------------------
+# Both expose the same upsert(ids, chunks, embeddings, source) / search(embedding, n_results)
+# pair; their clients are blocking, so the async routes call them through a thread.
+class ChromaBackend:
+    state_name = f"chroma-{DIMENSIONS}-{PRECISION}"
+
+    def __init__(self):
+        if PRECISION == "float32":
+            # chromadb is slow to import, so only load it once the backend is needed
+            import chromadb
+            from chromadb.config import Settings
+
+            chroma_client = chromadb.Client(Settings(
+                persist_directory='./chrome_store',
+                database_impl="duckdb+parquet"
+            ))
+            # A collection holds a single vector size, so shortened embeddings get their own
+            name = "my_kb" if DIMENSIONS == EMBEDDING_DIMENSIONS else f"my_kb-{DIMENSIONS}"
+            self.collection = chroma_client.get_or_create_collection(name=name)
+        else:
+            from vector_store import QuantizedVectorStore
+
+            self.store = QuantizedVectorStore(f"./quantized_store/{DIMENSIONS}-{PRECISION}", DIMENSIONS, PRECISION)
+
+    def upsert(self, ids, chunks, embeddings, source):
+        metadatas = [{"source": source}] * len(ids)
+        if PRECISION == "float32":
+            self.collection.upsert(ids=ids, documents=chunks, embeddings=embeddings, metadatas=metadatas)
+        else:
+            self.store.upsert(ids, embeddings, chunks, metadatas)
+
+    def search(self, query_embedding, n_results=2):
+        if PRECISION == "float32":
+            results = self.collection.query(query_embeddings=[query_embedding], n_results=n_results)
+            return results['documents'][0]
+        return [match["document"] for match in self.store.query(query_embedding, n_results)]
+
+
+class PineconeBackend:
+    state_name = f"pinecone-{DIMENSIONS}"
+
+    def __init__(self):
+        from pinecone import Pinecone, ServerlessSpec
+
+        pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+        # An index has a fixed dimension, so shortened embeddings get their own index
+        index_name = PINECONE_INDEX_NAME if DIMENSIONS == EMBEDDING_DIMENSIONS else f"{PINECONE_INDEX_NAME}-{DIMENSIONS}"
+        if index_name not in pc.list_indexes().names():
+            pc.create_index(
+                name=index_name,
+                dimension=DIMENSIONS,  # for text-embedding-3-small
+                metric="cosine",
+                spec=ServerlessSpec(
+                    cloud="aws",
+                    region="us-east-1"
+                )
+            )
+        self.index = pc.Index(index_name)
+
+    def upsert(self, ids, chunks, embeddings, source):
+        self.index.upsert([
+            (chunk_id, embedding, {"text": chunk, "source": source})
+            for chunk_id, chunk, embedding in zip(ids, chunks, embeddings)
+        ])
+
+    def search(self, query_embedding, n_results=2):
+        results = self.index.query(
+            vector=query_embedding,
+            top_k=n_results,
+            include_metadata=True
+        )
+        return [match['metadata']['text'] for match in results['matches']]
+
+
+BACKENDS = {"chroma": ChromaBackend, "pinecone": PineconeBackend}
+
+_backends = {}
+_ingest_queues = {}
+_lock = threading.Lock()
+
+
+def get_backend(name):
+    with _lock:
+        if name not in _backends:
+            _backends[name] = BACKENDS[name]()
+        return _backends[name]
+
+
+def get_ingest_queue(name):
+    backend = get_backend(name)
+    with _lock:
+        if name not in _ingest_queues:
+            # Ingestion workers are threads, so they get a blocking client of their own
+            _ingest_queues[name] = IngestQueue(
+                OpenAI(api_key=os.getenv("OPENAI_API_KEY")),
+                backend.upsert,
+                state_dir=f"./ingest_state/{backend.state_name}",
+                dimensions=DIMENSIONS
+            )
+        return _ingest_queues[name]
+
+
+# ----------------------------
+# Query
+# ----------------------------
+async def answer_query(name, query):
+    backend = await asyncio.to_thread(get_backend, name)
+    response = await get_openai_client().embeddings.create(
+        input=[query],
+        model=EMBEDDING_MODEL,
+        dimensions=DIMENSIONS
+    )
+    top_chunks = await asyncio.to_thread(backend.search, response.data[0].embedding, 2)
+    top_chunks_str = ", ".join(top_chunks)
+    return stream_llm(
+        f"You are a very good writer, who writes very good documents. Given {top_chunks_str} and {query}, give me a good answer, keep human touch.",
+        "rag.answer"
+    )
@@ -0,0 +1,74 @@
+from service.clients import ask_llm
+
+
+# ---------------- Functions ---------------- #
+# Step 1: Extract Pros and Cons
+async def extract_pros_cons(product_reviews):
+    pros_cons_prompt = f"""
+    You are a professional customer review analyst.
+
+    Your task is to extract key **pros and cons** from each review. 
+    Provide the output as a **list of dictionaries**, where each dictionary contains:
+    - "pros": a list of positive points
+    - "cons": a list of negative points
+
+    Only include factual or sentiment-backed observations (not vague statements).
+
+    Here are the reviews:
+    {product_reviews}
+    """
+    return await ask_llm(pros_cons_prompt, "reviews.extract_pros_cons")
+
+# Step 2: Group common feedback
+async def group_feedback(step_1_output):
+    group_feedback_prompt = f"""
+    You are an AI assistant helping to synthesize customer feedback.
+
+    From the extracted pros and cons below, identify **common themes** by grouping 
+    similar or semantically equivalent feedback into categories.
+
+    Return a JSON object with:
+    - "common_pros": List of grouped positive themes
+    - "common_cons": List of grouped negative themes
+
+    Avoid repeating similar items.
+
+    Extracted feedback:
+    {step_1_output}
+    """
+    return await ask_llm(group_feedback_prompt, "reviews.group_feedback")
+
+# Step 3: Generate Summary
+async def generate_summary(step_2_output):
+    generate_prompt = f"""
+    You are an AI product analyst.
+
+    Using the grouped customer feedback below, write a professional summary 
+    highlighting the main strengths and weaknesses of the product.
+
+    Structure:
+    **Strengths**
+    - Bullet point 1
+    - Bullet point 2
+    - ...
+
+    **Weaknesses**
+    - Bullet point 1
+    - Bullet point 2
+    - ...
+
+    Limit each section to 3–4 concise points.
+
+    Grouped Feedback:
+    {step_2_output}
+    """
+    return await ask_llm(generate_prompt, "reviews.summary")
+
+# Runs the three steps, yielding each result as soon as it is ready
+async def run_analysis(product_reviews):
+    step1_output = await extract_pros_cons(product_reviews)
+    yield {"event": "pros_cons", "output": step1_output}
+    step2_output = await group_feedback(step1_output)
+    yield {"event": "grouped", "output": step2_output}
+    final_summary = await generate_summary(step2_output)
+    yield {"event": "summary", "output": final_summary}
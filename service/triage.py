@@ -0,0 +1,203 @@
+# Bulk BotDesk triage for support queues.
+#
+#   python -m service.triage tickets.jsonl responses.jsonl --concurrency 16
+#
+# Each input line is a ticket: {"email": ..., "order_id": ... (optional), "message": ...}
+# and optionally a "ticket_id". Intent is classified locally with keyword rules, orders
+# are joined a batch of tickets at a time, and the BotDesk agents run with at most
+# `concurrency` calls in flight. Results are written as they complete (not in input order).
+import argparse
+import asyncio
+import json
+import re
+import time
+
+import numpy as np
+
+from service import botdesk
+
+BATCH_SIZE = 200
+
+# First match wins, so "refund" beats "return" for "return it and refund me".
+# Keywords match whole words only ("late" must not match "translate"), so the
+# inflected forms are listed explicitly.
+INTENT_KEYWORDS = [
+    ("Refund", ("refund", "refunds", "refunded", "money back", "reimburse", "reimbursement", "chargeback")),
+    ("Return Order", ("return", "returns", "returned", "returning", "send back", "send it back", "exchange",
+                      "pickup", "pick up")),
+    ("Track Order", ("where is", "where's", "track", "tracking", "status", "deliver", "delivered", "delivery",
+                     "shipping", "shipped", "shipment", "arrive", "arrived", "arriving", "late", "delay", "delayed")),
+]
+INTENT_PATTERNS = [
+    (intent, re.compile(r"\b(?:" + "|".join(re.escape(keyword) for keyword in keywords) + r")\b"))
+    for intent, keywords in INTENT_KEYWORDS
+]
+
+
+def classify_intent(message):
+    text = message.lower()
+    for intent, pattern in INTENT_PATTERNS:
+        if pattern.search(text):
+            return intent
+    return "General Support"
+
+
+def resolve_order(ticket, orders):
+    # The order the ticket names, or the customer's only order. With several orders and
+    # no order_id there is nothing that says which one they mean, so the ticket falls
+    # back to General Support rather than answering about the wrong order.
+    if ticket.get("order_id"):
+        return next((o for o in orders if o["order_id"] == ticket["order_id"]), None)
+    if len(orders) == 1:
+        return orders[0]
+    return None
+
+
+def validate_ticket(ticket):
+    # Runs before the batch join, so one malformed ticket can't take the batch down with it
+    if not isinstance(ticket.get("email"), str) or not ticket["email"]:
+        return "Ticket needs an email string."
+    if not isinstance(ticket.get("message"), str) or not ticket["message"].strip():
+        return "Ticket needs a non-empty message string."
+    if ticket.get("order_id") is not None and not isinstance(ticket["order_id"], str):
+        return "Ticket order_id must be a string."
+    return None
+
+
+async def handle_ticket(ticket):
+    start = time.perf_counter()
+    result = {"ticket_id": ticket["ticket_id"], "email": ticket.get("email"), "intent": ticket["intent"]}
+    try:
+        if "error" in ticket:
+            raise ValueError(ticket["error"])
+        order = ticket["order"]
+        result["order_id"] = order["order_id"] if order else None
+        chunks = botdesk.support_agent(ticket["intent"], order, ticket["email"], ticket["message"])
+        result["response"] = "".join([chunk async for chunk in chunks]).strip()
+    except Exception as e:
+        result["error"] = str(e)
+    result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+async def triage_tickets(tickets, concurrency=16):
+    # tickets: async iterable of ticket dicts, each with a ticket_id.
+    # Yields one result per ticket as it completes.
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    results = asyncio.Queue()
+
+    async def enqueue(batch):
+        for ticket in batch:
+            if "error" not in ticket and (error := validate_ticket(ticket)):
+                ticket["error"] = error
+        orders_by_email = botdesk.find_orders_many({t["email"] for t in batch if "error" not in t})
+        for ticket in batch:
+            if "error" not in ticket:
+                ticket["intent"] = classify_intent(ticket["message"])
+                ticket["order"] = None
+                if ticket["intent"] != "General Support":
+                    ticket["order"] = resolve_order(ticket, orders_by_email[ticket["email"]])
+                    # Without a matching order the order agents have nothing to go on
+                    if ticket["order"] is None:
+                        ticket["intent"] = "General Support"
+            ticket.setdefault("intent", None)
+            await queue.put(ticket)
+
+    async def producer():
+        try:
+            batch = []
+            async for ticket in tickets:
+                batch.append(ticket)
+                if len(batch) >= BATCH_SIZE:
+                    await enqueue(batch)
+                    batch = []
+            if batch:
+                await enqueue(batch)
+        finally:
+            for _ in range(concurrency):
+                await queue.put(None)
+
+    async def worker():
+        while (ticket := await queue.get()) is not None:
+            await results.put(await handle_ticket(ticket))
+        await results.put(None)
+
+    tasks = [asyncio.create_task(producer())] + [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        finished = 0
+        while finished < concurrency:
+            result = await results.get()
+            if result is None:
+                finished += 1
+            else:
+                yield result
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def parse_ticket(line, line_number):
+    try:
+        ticket = json.loads(line)
+    except json.JSONDecodeError as e:
+        return {"ticket_id": line_number, "error": f"Invalid JSON: {e}"}
+    if not isinstance(ticket, dict):
+        return {"ticket_id": line_number, "error": "Ticket must be a JSON object."}
+    return ticket
+
+
+async def read_tickets(path):
+    with open(path) as f:
+        for line_number, line in enumerate(f, start=1):
+            if line.strip():
+                ticket = parse_ticket(line, line_number)
+                ticket.setdefault("ticket_id", line_number)
+                yield ticket
+
+
+def summarize(results, elapsed):
+    ok = [r for r in results if "error" not in r]
+    latencies = np.array([r["latency_ms"] for r in ok])
+    intents = {}
+    for r in ok:
+        intents[r["intent"]] = intents.get(r["intent"], 0) + 1
+    return {
+        "tickets": len(results),
+        "errors": len(results) - len(ok),
+        "elapsed_s": round(elapsed, 2),
+        "throughput_per_s": round(len(results) / elapsed, 2) if elapsed else 0.0,
+        "latency_p50_ms": round(float(np.percentile(latencies, 50)), 1) if len(ok) else None,
+        "latency_p95_ms": round(float(np.percentile(latencies, 95)), 1) if len(ok) else None,
+        "latency_p99_ms": round(float(np.percentile(latencies, 99)), 1) if len(ok) else None,
+        "intents": intents,
+    }
+
+
+async def run(input_path, output_path, concurrency):
+    results = []
+    start = time.perf_counter()
+    with open(output_path, "w") as out:
+        async for result in triage_tickets(read_tickets(input_path), concurrency):
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            # Responses are already on disk; keep only what the summary needs
+            results.append({key: result[key] for key in ("intent", "latency_ms", "error") if key in result})
+    return summarize(results, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk BotDesk triage for a JSONL file of support tickets")
+    parser.add_argument("input", help="JSONL of tickets: email, optional order_id, message")
+    parser.add_argument("output", help="JSONL file the responses are streamed to")
+    parser.add_argument("--concurrency", type=int, default=16, help="agent calls in flight at once")
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    stats = asyncio.run(run(args.input, args.output, args.concurrency))
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import json
+import os
+
+from service.clients import create_completion, get_http_client, stream_completion
+
+WEATHER_API_KEY = os.getenv("WEATHER_API_KEY")
+TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+
+# ----------------------------
+# Tool Functions
+# ----------------------------
+async def web_search(query):
+    # Tavily's REST API on the shared httpx pool; the key is sent per request so it never
+    # ends up on the pool's default headers (and so on the weather calls)
+    response = await get_http_client().post(
+        TAVILY_SEARCH_URL,
+        json={"query": query, "max_results": 3},
+        headers={"Authorization": f"Bearer {TAVILY_API_KEY}"}
+    )
+    response.raise_for_status()
+    results = response.json().get("results", [])
+    content = "\n\n".join([r.get("content", "") for r in results])
+    return content or "No results found."
+
+
+async def get_weather(location):
+    response = await get_http_client().get(
+        "http://api.openweathermap.org/data/2.5/weather",
+        params={"q": location, "appid": WEATHER_API_KEY, "units": "metric"}
+    )
+    response = response.json()
+    if "main" in response:
+        temp = response["main"]["temp"]
+        return f"The temperature in {location} is {temp}°C."
+    else:
+        return f"Could not fetch weather for {location}. Please check the city name."
+
+
+tools_to_use = [
+    {
+        "type": "function",
+        "function": {
+            "name": "web_search",
+            "description": "Getting updated info from web",
+            "parameters": {
+                "type": "object",
+                "properties": {"query": {"type": "string"}},
+                "required": ["query"],
+                "additionalProperties": False
+            },
+            "strict": True
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_weather",
+            "description": "Get current temperature",
+            "parameters": {
+                "type": "object",
+                "properties": {"location": {"type": "string"}},
+                "required": ["location"],
+                "additionalProperties": False
+            },
+            "strict": True
+        }
+    }
+]
+
+
+def parse_tool_call(response):
+    # Returns (message, tool_call, arguments); malformed arguments escalate to a larger model
+    message = response.choices[0].message
+    if not message.tool_calls:
+        return message, None, None
+    tool_call = message.tool_calls[0]
+    return message, tool_call, json.loads(tool_call.function.arguments)
+
+
+async def smart_query(user_input):
+    # Tool selection
+    message, tool_call, arguments = await create_completion(
+        "websearch.tool_selection",
+        [{"role": "user", "content": user_input}],
+        parse_tool_call,
+        tools=tools_to_use
+    )
+    if tool_call is None:
+        yield message.content or ""
+        return
+
+    # Extract tool call
+    tool_name = tool_call.function.name
+
+    if tool_name == "web_search":
+        result = await web_search(arguments["query"])
+    elif tool_name == "get_weather":
+        result = await get_weather(arguments["location"])
+    else:
+        result = "Tool not found."
+
+    # Final GPT response with tool result, streamed back
+    async for text in stream_completion("websearch.answer", [
+        {"role": "user", "content": user_input},
+        {"role": "assistant", "tool_calls": [tool_call]},
+        {"role": "tool", "tool_call_id": tool_call.id, "name": tool_name, "content": result}
+    ]):
+        yield text
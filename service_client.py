@@ -0,0 +1,65 @@
+import json
+import os
+
+import requests
+
+# ----------------------------
+# Thin HTTP client the Streamlit pages use to reach the agents service (service/app.py)
+# ----------------------------
+# Streamlit also exports root-level secrets as environment variables, so SERVICE_URL
+# can be set in .streamlit/secrets.toml as well.
+SERVICE_URL = os.getenv("SERVICE_URL", "http://localhost:8000")
+
+
+class ServiceError(Exception):
+    # Raised for error responses and for transport failures (service down, cut-off stream)
+    pass
+
+
+class ServiceClient:
+    def __init__(self, base_url, timeout=300):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()  # keep-alive across reruns when cached
+
+    def _request(self, method, path, **kwargs):
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise ServiceError(f"Agents service unreachable: {e}") from e
+        if not response.ok:
+            try:
+                detail = response.json().get("detail", response.text)
+            except ValueError:
+                detail = response.text
+            response.close()
+            raise ServiceError(f"{response.status_code}: {detail}")
+        return response
+
+    def get(self, path, **params):
+        return self._request("GET", path, params=params).json()
+
+    def post(self, path, payload=None, **kwargs):
+        return self._request("POST", path, json=payload, **kwargs).json()
+
+    def stream_text(self, path, payload):
+        with self._request("POST", path, json=payload, stream=True) as response:
+            response.encoding = "utf-8"
+            try:
+                for chunk in response.iter_content(chunk_size=None, decode_unicode=True):
+                    if chunk:
+                        yield chunk
+            except requests.RequestException as e:
+                raise ServiceError(f"Response was cut off: {e}") from e
+
+    def stream_events(self, path, payload):
+        with self._request("POST", path, json=payload, stream=True) as response:
+            try:
+                for line in response.iter_lines():
+                    if line:
+                        event = json.loads(line)
+                        if event["event"] == "error":
+                            raise ServiceError(event["detail"])
+                        yield event
+            except requests.RequestException as e:
+                raise ServiceError(f"Response was cut off: {e}") from e
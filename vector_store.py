@@ -0,0 +1,220 @@
+import fcntl
+import json
+import os
+import threading
+
+import numpy as np
+
+# ----------------------------
+# Quantized on-disk vector store with full-precision rescoring
+# ----------------------------
+# Only the compact codes (float16, or int8 plus one float32 scale per vector) are held
+# in memory and scanned for every query. The float32 vectors stay in a file on disk and
+# are read back just for the top `n_results * rescore_factor` candidates, which are then
+# re-ranked at full precision. Vectors are L2-normalised on insert, so scores are cosine.
+# Row numbers are assigned from the in-memory index, so a store directory can only be
+# open in one process at a time (enforced with a file lock).
+
+PRECISIONS = ("float32", "float16", "int8")
+SCAN_BLOCK_ROWS = 4096
+
+
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def quantize(vectors, precision):
+    # Returns (codes, scales); scores are recovered as (codes @ q) * scales
+    if precision == "float32":
+        return vectors.astype(np.float32), np.ones(len(vectors), dtype=np.float32)
+    if precision == "float16":
+        return vectors.astype(np.float16), np.ones(len(vectors), dtype=np.float32)
+    if precision == "int8":
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales = np.maximum(scales, 1e-12).astype(np.float32)
+        codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales
+    raise ValueError(f"Unknown precision {precision!r}, expected one of {PRECISIONS}")
+
+
+def lock_directory(path):
+    # Held until the process exits; a second process gets an error instead of writing
+    # its own rows over the same file offsets
+    lock_file = open(os.path.join(path, "store.lock"), "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        raise RuntimeError(f"{path} is already in use by another process; run the service as a single process.")
+    return lock_file
+
+
+class QuantizedVectorStore:
+    def __init__(self, path, dimensions, precision="int8", rescore_factor=4):
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision {precision!r}, expected one of {PRECISIONS}")
+        self.path = path
+        self.dimensions = dimensions
+        self.precision = precision
+        self.rescore_factor = rescore_factor
+        os.makedirs(path, exist_ok=True)
+        self._lock_file = lock_directory(path)
+
+        self._lock = threading.Lock()
+        self._codes_path = os.path.join(path, f"codes.{precision}")
+        self._scales_path = os.path.join(path, "scales.f32")
+        self._full_path = os.path.join(path, "full.f32")
+        self._docs_path = os.path.join(path, "docs.jsonl")
+        self._load()
+
+    # ---------------- Persistence ---------------- #
+    def _load(self):
+        meta_path = os.path.join(self.path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta["dimensions"] != self.dimensions:
+                raise ValueError(
+                    f"Store at {self.path} holds {meta['dimensions']}-d vectors, not {self.dimensions}-d."
+                )
+        else:
+            with open(meta_path, "w") as f:
+                json.dump({"dimensions": self.dimensions}, f)
+
+        code_dtype = np.dtype(self.precision)
+        if os.path.exists(self._codes_path):
+            self._codes = np.fromfile(self._codes_path, dtype=code_dtype).reshape(-1, self.dimensions)
+            self._scales = np.fromfile(self._scales_path, dtype=np.float32)
+        else:
+            self._codes = np.empty((0, self.dimensions), dtype=code_dtype)
+            self._scales = np.empty(0, dtype=np.float32)
+        self._codes_buffer, self._scales_buffer = self._codes, self._scales
+
+        # Later lines win, so overwritten ids just append a new record
+        self._ids, self._documents, self._metadatas, self._rows = [], [], [], {}
+        if os.path.exists(self._docs_path):
+            with open(self._docs_path) as f:
+                for line in f:
+                    record = json.loads(line)
+                    self._set_record(record["row"], record["id"], record["document"], record["metadata"])
+        self._open_full()
+
+    def _reserve(self, rows):
+        # Grow the in-memory buffers geometrically so ingesting in batches stays linear
+        if rows <= len(self._codes_buffer):
+            return
+        capacity = max(rows, 2 * len(self._codes_buffer), 1024)
+        codes_buffer = np.empty((capacity, self.dimensions), dtype=self._codes_buffer.dtype)
+        codes_buffer[:len(self._codes)] = self._codes
+        scales_buffer = np.empty(capacity, dtype=np.float32)
+        scales_buffer[:len(self._scales)] = self._scales
+        self._codes_buffer, self._scales_buffer = codes_buffer, scales_buffer
+
+    def _open_full(self):
+        if self._codes.shape[0]:
+            self._full = np.memmap(self._full_path, dtype=np.float32, mode="r", shape=self._codes.shape)
+        else:
+            self._full = np.empty((0, self.dimensions), dtype=np.float32)
+
+    def _set_record(self, row, vector_id, document, metadata):
+        if row == len(self._ids):
+            self._ids.append(vector_id)
+            self._documents.append(document)
+            self._metadatas.append(metadata)
+        else:
+            self._ids[row], self._documents[row], self._metadatas[row] = vector_id, document, metadata
+        self._rows[vector_id] = row
+
+    @staticmethod
+    def _write_rows(file_path, rows, array):
+        # Append new rows, overwrite existing ones in place
+        mode = "r+b" if os.path.exists(file_path) else "w+b"
+        with open(file_path, mode) as f:
+            if rows == list(range(rows[0], rows[0] + len(rows))):
+                f.seek(rows[0] * array[0].nbytes)
+                f.write(np.ascontiguousarray(array).tobytes())
+                return
+            for row, values in zip(rows, array):
+                f.seek(row * values.nbytes)
+                f.write(values.tobytes())
+
+    # ---------------- Writes ---------------- #
+    def upsert(self, ids, embeddings, documents, metadatas=None):
+        vectors = normalize(embeddings)
+        if vectors.shape[1] != self.dimensions:
+            raise ValueError(f"Expected {self.dimensions}-d embeddings, got {vectors.shape[1]}-d.")
+        metadatas = metadatas or [{}] * len(ids)
+        codes, scales = quantize(vectors, self.precision)
+
+        with self._lock:
+            rows = []
+            next_row = len(self._ids)
+            for vector_id in ids:
+                if vector_id in self._rows:
+                    rows.append(self._rows[vector_id])
+                else:
+                    rows.append(next_row)
+                    self._rows[vector_id] = next_row
+                    next_row += 1
+
+            self._write_rows(self._full_path, rows, vectors)
+            self._write_rows(self._codes_path, rows, codes)
+            self._write_rows(self._scales_path, rows, scales)
+            with open(self._docs_path, "a") as f:
+                for row, vector_id, document, metadata in zip(rows, ids, documents, metadatas):
+                    f.write(json.dumps({"row": row, "id": vector_id, "document": document, "metadata": metadata}) + "\n")
+
+            self._reserve(next_row)
+            self._codes_buffer[rows] = codes
+            self._scales_buffer[rows] = scales
+            self._codes = self._codes_buffer[:next_row]
+            self._scales = self._scales_buffer[:next_row]
+
+            for row, vector_id, document, metadata in zip(rows, ids, documents, metadatas):
+                self._set_record(row, vector_id, document, metadata)
+            self._open_full()
+
+    # ---------------- Reads ---------------- #
+    def count(self):
+        return len(self._ids)
+
+    def memory_bytes(self):
+        # What the store keeps resident for scanning; full-precision vectors stay on disk
+        return self._codes_buffer.nbytes + self._scales_buffer.nbytes
+
+    def query(self, query_embedding, n_results=2, rescore=True):
+        query = normalize(query_embedding).reshape(-1)
+        with self._lock:
+            codes, scales, full = self._codes, self._scales, self._full
+            total = codes.shape[0]
+            if total == 0:
+                return []
+
+            # First pass over the compact codes, in blocks to bound the float32 temporaries
+            approx = np.empty(total, dtype=np.float32)
+            for start in range(0, total, SCAN_BLOCK_ROWS):
+                block = codes[start:start+SCAN_BLOCK_ROWS]
+                approx[start:start+len(block)] = (block.astype(np.float32, copy=False) @ query) * scales[start:start+len(block)]
+
+            n_results = min(n_results, total)
+            if rescore and self.precision != "float32":
+                n_candidates = min(total, n_results * self.rescore_factor)
+                candidates = np.argpartition(-approx, n_candidates - 1)[:n_candidates]
+                candidates.sort()  # sequential reads from the memmap
+                scores = full[candidates] @ query
+            else:
+                candidates = np.argpartition(-approx, n_results - 1)[:n_results]
+                scores = approx[candidates]
+
+            order = np.argsort(-scores)[:n_results]
+            return [
+                {
+                    "id": self._ids[candidates[i]],
+                    "score": float(scores[i]),
+                    "document": self._documents[candidates[i]],
+                    "metadata": self._metadatas[candidates[i]],
+                }
+                for i in order
+            ]